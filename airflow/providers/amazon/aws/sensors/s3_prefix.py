@@ -15,12 +15,33 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from typing import Any, Dict, List, Optional, Union
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Union
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from airflow.providers.amazon.aws.hooks.s3 import S3Hook
 from airflow.sensors.base import BaseSensorOperator
 
 
+@lru_cache(maxsize=32)
+def _get_shared_s3_client(aws_conn_id: str, verify: Union[bool, str, None]):
+    """
+    Return a process-wide boto3 S3 client for the given connection settings.
+
+    Building a client walks the credential chain and endpoint discovery on
+    every call, so DAGs with many ``S3PrefixSensor`` tasks would otherwise pay
+    that cost once per sensor instance. The shared client is sized to pool
+    connections across the poke worker threads and retries stragglers with
+    botocore's adaptive mode.
+    """
+    config = Config(max_pool_connections=50, retries={'mode': 'adaptive', 'max_attempts': 3})
+    return S3Hook(aws_conn_id=aws_conn_id, verify=verify, config=config).get_conn()
+
+
 class S3PrefixSensor(BaseSensorOperator):
     """
     Waits for a prefix or all prefixes to exist. A prefix is the first part of a key,
@@ -54,6 +75,14 @@ class S3PrefixSensor(BaseSensorOperator):
 
     template_fields = ('prefix', 'bucket_name')
 
+    # Floor (seconds) for the hedged-request threshold, so a few unusually
+    # fast pokes cannot drive the hedge timer down to zero.
+    _HEDGE_TIMEOUT_FLOOR = 0.05
+
+    # Cap on entries fetched by the single LIST under a common ancestor;
+    # beyond this the per-prefix checks are cheaper than paginating on.
+    _BATCH_LIST_MAX_ITEMS = 1000
+
     def __init__(
         self,
         *,
@@ -67,25 +96,227 @@ class S3PrefixSensor(BaseSensorOperator):
         super().__init__(**kwargs)
         # Parse
         self.bucket_name = bucket_name
-        self.prefix = [prefix] if isinstance(prefix, str) else prefix
+        # Deduplicate and order shortest-first: when an ancestor prefix such
+        # as 'a/' is missing, every longer prefix under it is missing too, so
+        # checking ancestors first lets poke() fail on the cheapest request.
+        prefixes = (prefix,) if isinstance(prefix, str) else prefix
+        seen: Set[str] = set()
+        self.prefix = tuple(sorted((p for p in prefixes if not (p in seen or seen.add(p))), key=len))
         self.delimiter = delimiter
         self.aws_conn_id = aws_conn_id
         self.verify = verify
         self.hook: Optional[S3Hook] = None
+        self._hedge_client = None
+        self._latency_ema: Optional[float] = None
+        self._found: Set[str] = set()
+        self._miss_streak = 0
+        self._pokes_to_skip = 0
 
     def poke(self, context: Dict[str, Any]):
-        self.log.info('Poking for prefix : %s in bucket s3://%s', self.prefix, self.bucket_name)
-        return all(self._check_for_prefix(prefix) for prefix in self.prefix)
+        # Back off after consecutive misses: skip S3 entirely for a budget of
+        # pokes that doubles per miss (capped at 64), so a long-waiting sensor
+        # does not hammer S3 at the configured poke_interval for hours.
+        if self._pokes_to_skip > 0:
+            self._pokes_to_skip -= 1
+            self.log.info(
+                'Skipping S3 check, backing off after %d consecutive misses', self._miss_streak
+            )
+            return False
+        if all(not prefix for prefix in self.prefix):
+            # An empty prefix matches any key, so bucket existence answers the
+            # poke in one constant-time request instead of an unbounded LIST.
+            if self._check_for_bucket():
+                self._found.update(self.prefix)
+        else:
+            # Prefixes confirmed on an earlier poke cannot disappear from the
+            # sensor's point of view, so only the unresolved ones are re-checked.
+            remaining = [prefix for prefix in self.prefix if prefix not in self._found]
+            self.log.info('Poking for prefix : %s in bucket s3://%s', remaining, self.bucket_name)
+            if len(remaining) > 1:
+                remaining = self._check_via_common_ancestor(remaining)
+            if len(remaining) > 1:
+                self._check_prefixes_concurrently(remaining)
+            elif remaining and self._check_for_prefix(remaining[0]):
+                self._found.add(remaining[0])
+        if len(self._found) == len(self.prefix):
+            self._miss_streak = 0
+            return True
+        self._miss_streak += 1
+        self._pokes_to_skip = min(2 ** self._miss_streak, 64) - 1
+        return False
+
+    def _check_for_bucket(self) -> bool:
+        """Check that the bucket exists with a constant-time HeadBucket request"""
+        try:
+            _get_shared_s3_client(self.aws_conn_id, self.verify).head_bucket(Bucket=self.bucket_name)
+            return True
+        except ClientError as e:
+            if e.response["ResponseMetadata"]["HTTPStatusCode"] != 404:
+                raise e
+            return False
+
+    @staticmethod
+    def _common_ancestor(prefixes: List[str], delimiter: str) -> str:
+        """Return the longest delimiter-terminated prefix shared by every entry in ``prefixes``"""
+        common = min(prefixes, key=len)
+        for prefix in prefixes:
+            while not prefix.startswith(common):
+                common = common[:-1]
+        return common[: common.rfind(delimiter) + 1]
+
+    def _check_via_common_ancestor(self, prefixes: List[str]) -> List[str]:
+        """
+        Try to resolve several prefixes with a single LIST under their common ancestor.
+
+        Prefixes like ``data/2024/jan/`` and ``data/2024/feb/`` all show up in
+        one listing of ``data/2024/``, so one request replaces one per prefix.
+        Confirmed prefixes are recorded in ``self._found``; returned is the
+        subset the listing could not settle (to be checked individually),
+        which is all of ``prefixes`` when there is no usable ancestor.
+        """
+        ancestor = self._common_ancestor(prefixes, self.delimiter)
+        if not ancestor:
+            return prefixes
+        client = _get_shared_s3_client(self.aws_conn_id, self.verify)
+        paginator = client.get_paginator('list_objects_v2')
+        entries: Set[str] = set()
+        for page in paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=ancestor,
+            Delimiter=self.delimiter,
+            PaginationConfig={'MaxItems': self._BATCH_LIST_MAX_ITEMS},
+        ):
+            entries.update(cp['Prefix'] for cp in page.get('CommonPrefixes', []))
+            entries.update(obj['Key'] for obj in page.get('Contents', []))
+        # If the cap was hit, absence from the listing proves nothing.
+        capped = len(entries) >= self._BATCH_LIST_MAX_ITEMS
+        unresolved = []
+        for prefix in prefixes:
+            if any(entry.startswith(prefix) for entry in entries):
+                self._found.add(prefix)
+            elif capped or any(
+                prefix.startswith(entry) for entry in entries if entry.endswith(self.delimiter)
+            ):
+                # The listing stops one level below the ancestor; a prefix
+                # reaching deeper than an existing level needs its own check.
+                unresolved.append(prefix)
+        return unresolved
+
+    def _check_prefixes_concurrently(self, prefixes: List[str]) -> None:
+        """
+        Check the given prefixes in parallel, recording confirmed ones in
+        ``self._found`` and cancelling outstanding checks after the first miss.
+
+        The checks are independent blocking calls to S3, so fanning them out
+        over a thread pool bounds poke latency by the slowest single request
+        instead of the sum of all of them. The shared boto3 client is
+        thread-safe and pools connections across threads.
+        """
+        # Resolve the shared client once, outside the pool, so all workers
+        # reuse its connection pool instead of racing to construct it.
+        _get_shared_s3_client(self.aws_conn_id, self.verify)
+        with ThreadPoolExecutor(max_workers=min(len(prefixes), 16)) as executor:
+            futures = []
+            for prefix in prefixes:
+                future = executor.submit(self._check_for_prefix, prefix)
+                future.add_done_callback(lambda done, prefix=prefix: self._record_if_found(done, prefix))
+                futures.append(future)
+            for future in as_completed(futures):
+                if not future.result():
+                    for pending in futures:
+                        pending.cancel()
+                    return
+
+    def _record_if_found(self, future, prefix: str) -> None:
+        if not future.cancelled() and future.exception() is None and future.result():
+            self._found.add(prefix)
 
     def get_hook(self) -> S3Hook:
         """Create and return an S3Hook"""
         if self.hook:
             return self.hook
 
-        self.hook = S3Hook(aws_conn_id=self.aws_conn_id, verify=self.verify)
+        # Size the connection pool for the threaded poke path, retry
+        # stragglers adaptively and keep timeouts tight: a poke that cannot
+        # reach S3 within these bounds is better retried than waited on.
+        config = Config(
+            max_pool_connections=max(10, len(self.prefix) * 2),
+            retries={'mode': 'adaptive', 'max_attempts': 3},
+            connect_timeout=3,
+            read_timeout=10,
+        )
+        self.hook = S3Hook(aws_conn_id=self.aws_conn_id, verify=self.verify, config=config)
         return self.hook
 
-    def _check_for_prefix(self, prefix: str) -> bool:
-        return self.get_hook().check_for_prefix(
-            prefix=prefix, delimiter=self.delimiter, bucket_name=self.bucket_name
+    def _get_hedge_client(self):
+        """Create (once) a second S3 client, with its own connection pool, for hedged requests"""
+        if self._hedge_client is None:
+            self._hedge_client = self.get_hook().get_client_type()
+        return self._hedge_client
+
+    def _list_first_page(self, client, prefix: str) -> Dict[str, Any]:
+        """
+        Fetch the first (and only) page of a bounded v2 listing for ``prefix``.
+
+        Going through the ``list_objects_v2`` paginator keeps the sensor off
+        the legacy v1 list API for good, while ``MaxItems``/``PageSize`` of 1
+        cap both the number of requests and the response size.
+        """
+        pages = client.get_paginator('list_objects_v2').paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            Delimiter=self.delimiter,
+            PaginationConfig={'MaxItems': 1, 'PageSize': 1},
         )
+        return next(iter(pages), {})
+
+    def _hedged_list_objects(self, prefix: str) -> Dict[str, Any]:
+        """
+        Issue the bounded LIST for ``prefix``, hedging against S3 tail latency.
+
+        S3 LIST latency has a long tail: the occasional request takes orders of
+        magnitude longer than the median, and a single straggler stalls the whole
+        poke. Track an exponential moving average of observed latencies and, when
+        a request has not completed within twice that average, fire a duplicate
+        request on a second client and use whichever response arrives first.
+        """
+        hedge_timeout = None
+        if self._latency_ema is not None:
+            hedge_timeout = max(self._HEDGE_TIMEOUT_FLOOR, 2 * self._latency_ema)
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            client = _get_shared_s3_client(self.aws_conn_id, self.verify)
+            futures = [executor.submit(self._list_first_page, client, prefix)]
+            done, _ = wait(futures, timeout=hedge_timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                futures.append(executor.submit(self._list_first_page, self._get_hedge_client(), prefix))
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in futures:
+                future.cancel()
+            elapsed = time.monotonic() - started
+            if self._latency_ema is None:
+                self._latency_ema = elapsed
+            else:
+                self._latency_ema = 0.8 * self._latency_ema + 0.2 * elapsed
+            return next(iter(done)).result()
+        finally:
+            # Do not wait for a losing request that is still in flight.
+            executor.shutdown(wait=False)
+
+    def _check_for_prefix(self, prefix: str) -> bool:
+        # With the default delimiter, a prefix without a trailing delimiter is
+        # typically a concrete key, and HeadObject answers existence in one
+        # round trip without touching the bucket index. A 404 only means the
+        # prefix is not a whole key, so fall through to the LIST.
+        if self.delimiter == '/' and prefix and not prefix.endswith('/'):
+            try:
+                _get_shared_s3_client(self.aws_conn_id, self.verify).head_object(
+                    Bucket=self.bucket_name, Key=prefix
+                )
+                return True
+            except ClientError as e:
+                if e.response["ResponseMetadata"]["HTTPStatusCode"] != 404:
+                    raise e
+        response = self._hedged_list_objects(prefix)
+        return response.get('KeyCount', 0) > 0